@@ -1,12 +1,65 @@
+import asyncio
+import atexit
 import json
 import os
-from openai import BaseModel, OpenAI
+import random
+import re
+import threading
+import time
+from openai import BaseModel, AsyncOpenAI, InternalServerError, RateLimitError
 import string
-from concurrent.futures import ThreadPoolExecutor, as_completed 
+from functools import lru_cache
 from pathlib import Path
+import httpx
 import redis
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from llm_cache import LLMCache, cache_key
+
+# Tuned connection pool for the high-concurrency character runs: keep TLS
+# connections to api.openai.com alive between requests (skipping the
+# ~150ms handshake each time) and multiplex concurrent requests over HTTP/2.
+# The client lives for the whole process, so the pool stays warm across
+# Flask requests.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=50,
+        keepalive_expiry=600
+    ),
+    http2=True,
+    timeout=httpx.Timeout(60.0, connect=10.0)
+)
+
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+
+# All OpenAI coroutines run on one long-lived background event loop. A fresh
+# asyncio.run() per Flask call would strand the client's keep-alive
+# connections on already-closed loops: the second call that reuses a pooled
+# connection dies with "RuntimeError: Event loop is closed".
+background_loop = asyncio.new_event_loop()
+threading.Thread(target=background_loop.run_forever, daemon=True,
+                 name="openai-loop").start()
+
+def run_async(coro):
+    """Run a coroutine on the background loop and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, background_loop).result()
+
+def close_client():
+    # Drain the keep-alive pool on the loop that owns it, then stop the loop
+    run_async(client.close())
+    background_loop.call_soon_threadsafe(background_loop.stop)
+
+atexit.register(close_client)
+
+# Static prompt templates, read once at import instead of once per character
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+INTRODUCTION_PROMPT = (PROMPTS_DIR / "introduction.txt").read_text()
+PRE_PROMPT = (PROMPTS_DIR / "pre.txt").read_text()
+POST_PROMPT = (PROMPTS_DIR / "post.txt").read_text()
+
+# Temperature for the free-form query_gpt calls; shared by the request
+# itself and the cache key so the two can never drift apart
+QUERY_TEMPERATURE = 1.2
 
 # ============================================
 # REDIS CACHE SETUP
@@ -29,30 +82,35 @@ else:
         decode_responses=True  # Automatically convert bytes to strings
     )
 
+# Deterministic response cache keyed on the exact request payload - hits
+# skip the OpenAI call entirely (see llm_cache.py)
+llm_cache = LLMCache(redis_client)
+
+@lru_cache(maxsize=1)
+def load_all_characters():
+    """
+    Load all-characters.json once and keep it in memory; every character
+    lookup afterwards is a dict access instead of a file parse.
+    """
+    json_path = Path(__file__).parent.parent / "frontend" / "public" / "characters" / "data" / "all-characters.json"
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 def get_character_info(char_id):
     """
     Get character name and persona from all-characters.json
-    
+
     Args:
         char_id (str or int): Character ID (e.g., "1", "0001", or 1)
-    
+
     Returns:
         dict: {'name': str, 'persona': str} or None if not found
     """
     # Format the character ID with leading zeros
-    char_id_str = str(char_id)
-    while len(char_id_str) < 4:
-        char_id_str = "0" + char_id_str
-    
-    char_key = f"character_{char_id_str}"
-    
-    # Path to the JSON file (change this to your actual path)
-    json_path = Path(__file__).parent.parent / "frontend" / "public" / "characters" / "data" / "all-characters.json"
-    
-    # Load and extract data
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
+    char_key = f"character_{int(char_id):04d}"
+
+    data = load_all_characters()
+
     if char_key in data["characters"]:
         character = data["characters"][char_key]
         return {
@@ -222,33 +280,42 @@ def clear_all_characters():
         redis_client.delete(*keys)
 
 def cleanAnswers():
+    # One directory scan instead of 1000 constructed paths. Truncating in
+    # place halves the syscalls of an open/close pair and skips characters
+    # that don't have answer files yet instead of creating empty ones.
+    with os.scandir("char_x1000") as entries:
+        for entry in entries:
+            for name in ("answer.txt", "short-answer.txt"):
+                path = os.path.join(entry.path, name)
+                if os.path.exists(path):
+                    os.truncate(path, 0)
 
-    for i in range(1, 1001):
-
-        # ID should be padded on the left with 0s.
-        char_id = str(i)
-        while (len(char_id) < 4): char_id = "0" + char_id
-
-        # Empty the answer and short-answer files
-        dir_path = f"char_x1000/character_{char_id}"
-        full_path = os.path.join(dir_path, "answer.txt")
-        short_path = os.path.join(dir_path, "short-answer.txt")
+async def query_gpt(prompt, model = "gpt-4o-mini"):
+    # Accept either a plain system prompt or a prebuilt messages list;
+    # structured messages keep the static content in a stable prefix that
+    # OpenAI's server-side prompt caching can reuse across calls
+    if isinstance(prompt, str):
+        messages = [
+            {"role": "system", "content": prompt}
+        ]
+    else:
+        messages = prompt
 
-        # Empty the files
-        open(full_path, 'w').close()
-        open(short_path, 'w').close()
+    # Return the cached response for a payload we've already sent
+    key = cache_key(model, messages, QUERY_TEMPERATURE)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return cached
 
-def query_gpt(prompt, model = "gpt-4o-mini"):
-    response = client.chat.completions.create(model=model,
-    messages=[
-        {"role": "system", "content": prompt}
-    ],
+    response = await client.chat.completions.create(model=model,
+    messages=messages,
     max_tokens=150,       # limit the response length
-    temperature=1.2       # randomness of output
+    temperature=QUERY_TEMPERATURE  # randomness of output
     )
 
     # Extract the assistant’s reply
     message = response.choices[0].message.content
+    llm_cache.set(key, message)
     return message
 
 class CharacterResponse(BaseModel):
@@ -266,7 +333,7 @@ class CharacterQuestionResponse(BaseModel):
     answer: bool   # Yes/No answer
     passion: float # Passion score from 0.0 to 1.0
     
-def createNamePersona_x100():
+async def createNamePersona_x100():
     # Path to the JSON file
     json_path = Path(__file__).parent.parent / "frontend" / "public" / "characters" / "data" / "all-characters.json"
     
@@ -276,11 +343,7 @@ def createNamePersona_x100():
 
     for char_id in range(1, 101):
         # Format the character ID with leading zeros
-        char_id_str = str(char_id)
-        while len(char_id_str) < 4:
-            char_id_str = "0" + char_id_str
-        
-        char_key = f"character_{char_id_str}"
+        char_key = f"character_{char_id:04d}"
         
         # Get character description
         description = data["characters"][char_key]["description"]
@@ -293,7 +356,7 @@ def createNamePersona_x100():
         for attempt in range(max_retries):
             try:
                 # Make API call
-                response = client.chat.completions.create(
+                response = await client.chat.completions.create(
                     model="gpt-4o-mini",
                     messages=[
                         {"role": "system", "content": prompt}
@@ -336,35 +399,39 @@ def createNamePersona_x100():
     print(f"Saving updated file to {json_path}...")
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
-    
+
+    # The in-memory copy used by get_character_info is now stale
+    load_all_characters.cache_clear()
+
     print("Done!")
 
-def considerQuestion(question, char_id):
+async def considerQuestion(question, char_id,
+                           introduction_prompt=INTRODUCTION_PROMPT,
+                           pre_prompt=PRE_PROMPT,
+                           post_prompt=POST_PROMPT):
     # ID should be padded on the left with 0s.
-    char_id = str(char_id)
-    while (len(char_id) < 4): char_id = "0" + char_id
+    char_id = f"{int(char_id):04d}"
 
     # Extract character persona and name.
     char_info = get_character_info(char_id)
 
-    with (
-        open('prompts/introduction.txt', 'r') as intro_f,
-        open('prompts/pre.txt', 'r') as pre_f,
-        open('prompts/post.txt', 'r') as post_f,
-    ):
-        introduction_prompt = intro_f.read()
-        pre_prompt = pre_f.read()
-        post_prompt = post_f.read()
+    # The persona + introduction system message is byte-identical across
+    # both calls (and across reruns of the same character), so the
+    # description is only billed once where the server-side prefix cache
+    # kicks in. The dynamic question goes last, in its own user message.
+    system_message = {"role": "system", "content": char_info['persona'] + introduction_prompt}
+
+    response_1 = await query_gpt([system_message])
+    messages_2 = [
+        system_message,
+        {"role": "assistant", "content": response_1},
+        {"role": "user", "content": pre_prompt + question + post_prompt}
+    ]
 
-    response_1 = query_gpt(char_info['persona'] + introduction_prompt)
-    prompt_2 = char_info['persona'] + introduction_prompt + response_1 + pre_prompt + question + post_prompt
-    
     # Use structured output for the response
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": prompt_2}
-        ],
+        messages=messages_2,
         response_format={
             "type": "json_schema",
             "json_schema": {
@@ -380,45 +447,52 @@ def considerQuestion(question, char_id):
     # Parse and return the structured response
     return json.loads(response.choices[0].message.content)
 
+# The post prompt asks characters to finish with an explicit "Yes" or "No" -
+# with quotation marks - so match the verdict at the end of the reply in any
+# case, allowing closing quotes around the optional punctuation
+ANSWER_RE = re.compile(r'\b(yes|no)\b["\'”]?[.!]?["\'”]?\s*$', re.IGNORECASE)
+
 def getAnswer(prompt):
-    short = prompt[-60:]
-    if "yes" in short or "Yes" in short:
-        return True
-    else:
-        return False
-    
-def writeOut(answer, char_id):
-    # ID should be padded on the left with 0s.
-    char_id = str(char_id)
-    while (len(char_id) < 4): char_id = "0" + char_id
+    match = ANSWER_RE.search(prompt[-60:])
+    return bool(match and match.group(1).lower() == 'yes')
 
-    # Build the directory path
-    dir_path = f"char_x1000/character_{char_id}"
-    os.makedirs(dir_path, exist_ok=True)
 
-    # Paths for the full and short answer files
-    full_path = os.path.join(dir_path, "answer.txt")
-    short_path = os.path.join(dir_path, "short-answer.txt")
+def ensureCharacterDirs(num):
+    # Preflight: create every character directory in one pass so writeOut
+    # doesn't pay a stat/mkdir per character in the hot loop
+    for i in range(1, num+1):
+        os.makedirs(f"char_x1000/character_{i:04d}", exist_ok=True)
 
-    # Write full answer
-    # with open(full_path, "w", encoding="utf-8") as f:
-    #     f.write(answer)
+def writeOut(answer, char_id):
+    # ID should be padded on the left with 0s. The character directory is
+    # expected to exist already (see ensureCharacterDirs).
+    char_id = f"{int(char_id):04d}"
+    dir_path = Path(f"char_x1000/character_{char_id}")
 
     # Generate and write short answer
-    short_answer = getAnswer(answer)
-    if short_answer: short_answer = "Yes"
-    else: short_answer = "No"
+    short_answer = "Yes" if getAnswer(answer) else "No"
     print(short_answer)
-    with open(short_path, "w", encoding="utf-8") as f:
-        f.write(short_answer)
+    (dir_path / "short-answer.txt").write_text(short_answer, encoding="utf-8")
+    return short_answer
 
-def process_character(char_id, question):
+def writeShortAnswers(results, path="short_answers.tsv"):
+    """
+    Write the aggregated char_id<TAB>answer index in one buffered pass
+    instead of a thousand per-character file writes.
+
+    Args:
+        results: iterable of (char_id, 'Yes'/'No') pairs
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{char_id}\t{answer}\n" for char_id, answer in results)
+
+async def process_character(char_id, question):
     """
     Process a single character's response to a question.
     Now returns structured response with response text, answer, and passion.
     Updates Redis cache with the conversation, answer, and passion.
     """
-    result = considerQuestion(question, char_id)
+    result = await considerQuestion(question, char_id)
     
     # Extract structured data
     response_text = result['response']
@@ -436,7 +510,7 @@ def process_character(char_id, question):
         'passion': passion_score
     }
 
-def character_conversation_response(char_id, conversation_so_far):
+async def character_conversation_response(char_id, conversation_so_far):
     """
     Get a character's response to the ongoing conversation.
     
@@ -458,11 +532,11 @@ Conversation so far:
 {conversation_so_far}
 
 As {char_info['name']}, respond to this conversation with your thoughts. Keep your response conversational and under 100 words."""
-    
-    response = query_gpt(prompt)
+
+    response = await query_gpt(prompt)
     return response
 
-def check_mind_changed(char_id, conversation_log):
+async def check_mind_changed(char_id, conversation_log):
     """
     Ask a character if their mind has changed after the conversation.
     
@@ -486,7 +560,7 @@ After this conversation:
 Has your answer changed? Respond with your final position on the question."""
     
     # Use structured output for the response
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": prompt}
@@ -502,46 +576,169 @@ Has your answer changed? Respond with your final position on the question."""
         max_tokens=800,
         temperature=0.8
     )
-    
+
     result = json.loads(response.choices[0].message.content)
     return {
         'answer': result['answer'],
         'passion': result['passion']
     }
 
-def promptCharacters(question, num):
+# ============================================
+# RATE-LIMITED PARALLEL PROCESSING
+# ============================================
+# Client-side throttling modelled on OpenAI's api_request_parallel_processor
+# cookbook script: both a requests-per-minute and a tokens-per-minute bucket
+# refill continuously, and each character waits until both have room before
+# its API calls go out. This keeps the pipe full right up to the account
+# quota instead of burning requests on 429 responses.
+
+MAX_REQUESTS_PER_MINUTE = 450
+MAX_TOKENS_PER_MINUTE = 180_000
+MAX_ATTEMPTS = 5
+
+class RateLimiter:
+    """Token buckets for OpenAI's RPM and TPM limits."""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_request_capacity = float(requests_per_minute)
+        self.available_token_capacity = float(tokens_per_minute)
+        self.last_update_time = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.available_request_capacity = min(
+            self.available_request_capacity + self.requests_per_minute * elapsed / 60.0,
+            self.requests_per_minute,
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + self.tokens_per_minute * elapsed / 60.0,
+            self.tokens_per_minute,
+        )
+        self.last_update_time = now
+
+    async def acquire(self, tokens, requests=1):
+        """Block until both buckets can cover the upcoming call(s)."""
+        while True:
+            self._refill()
+            if (self.available_request_capacity >= requests
+                    and self.available_token_capacity >= tokens):
+                self.available_request_capacity -= requests
+                self.available_token_capacity -= tokens
+                return
+            await asyncio.sleep(0.1)
+
+def estimate_character_tokens(question):
+    """
+    Rough token budget for one character: two completions (max_tokens 150
+    and 800) plus the prompts at ~4 characters per token. The persona and
+    prompt-template text is approximated with a flat 500-token pad.
+    """
+    return 150 + 800 + 500 + len(question) // 4
+
+def loadCheckpoint(checkpoint_path, question):
+    """
+    Return previously completed results for this question, or {} if there
+    is no checkpoint or it belongs to a different question.
+    """
+    if not os.path.exists(checkpoint_path):
+        return {}
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if checkpoint.get('question') != question:
+        return {}
+    return {int(char_id): result for char_id, result in checkpoint.get('results', {}).items()}
+
+def saveCheckpoint(checkpoint_path, question, results):
+    with open(checkpoint_path, 'w', encoding='utf-8') as f:
+        json.dump({'question': question, 'results': results}, f)
+
+async def promptCharacters(question, num, max_concurrency=50,
+                           checkpoint_path="checkpoint.json", checkpoint_every=50):
     count_yes = 0
     count_no  = 0
     total_passion = 0.0
 
-    # Use ThreadPoolExecutor to parallelize API calls
-    # max_workers can be adjusted based on API rate limits
-    with ThreadPoolExecutor(max_workers=500) as executor:
-        # Submit all tasks
-        future_to_char = {
-            executor.submit(process_character, i, question): i 
-            for i in range(1, num+1)
-        }
-        
-        # Process results as they complete
-        for future in as_completed(future_to_char):
-            char_id = future_to_char[future]
+    # Results are persisted as characters finish, so a crash at character
+    # 700 keeps 700 results; rerunning the same question picks up from the
+    # checkpoint instead of starting over.
+    results = loadCheckpoint(checkpoint_path, question) if checkpoint_path else {}
+    if results:
+        print(f"Resuming from checkpoint: {len(results)} characters already completed")
+
+    limiter = RateLimiter(MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE)
+    estimated_tokens = estimate_character_tokens(question)
+    completed = 0  # completions since the last checkpoint write
+
+    # Each queue item is (char_id, attempts); failed characters are requeued
+    # with backoff rather than retried inline, so a stretch of 429s doesn't
+    # serialize the whole run behind one slow character.
+    queue = asyncio.Queue()
+    for i in range(1, num+1):
+        if i not in results:
+            queue.put_nowait((i, 0))
+
+    async def worker():
+        nonlocal completed
+        while True:
             try:
-                result = future.result()
-                answer = result['answer']
-                passion = result['passion']
-                
-                if answer:
-                    count_yes += 1
+                char_id, attempts = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            # Each character issues two chat completions
+            await limiter.acquire(estimated_tokens, requests=2)
+            try:
+                results[char_id] = await process_character(char_id, question)
+                completed += 1
+                if checkpoint_path and completed % checkpoint_every == 0:
+                    saveCheckpoint(checkpoint_path, question, results)
+            except (RateLimitError, InternalServerError) as exc:
+                attempts += 1
+                if attempts >= MAX_ATTEMPTS:
+                    print(f"Character {char_id} failed after {MAX_ATTEMPTS} attempts: {exc}")
                 else:
-                    count_no += 1
-                
-                total_passion += passion
-                print(f"Character {char_id} completed: {'Yes' if answer else 'No'} (passion: {passion:.2f})")
+                    # Exponential backoff with jitter before requeueing
+                    await asyncio.sleep(2 ** attempts + random.random())
+                    queue.put_nowait((char_id, attempts))
             except Exception as exc:
                 print(f"Character {char_id} generated an exception: {exc}")
-                count_no += 1  # Count errors as "No" votes
-    
+
+    workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+    await asyncio.gather(*workers)
+
+    if checkpoint_path:
+        if len(results) == num:
+            # Fully complete run: drop the checkpoint so the same question
+            # can be polled fresh next time
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+        else:
+            # Keep the partial results so a rerun retries only the failures
+            saveCheckpoint(checkpoint_path, question, results)
+
+    for char_id in range(1, num+1):
+        result = results.get(char_id)
+        if result is None:
+            count_no += 1  # Count errors as "No" votes
+            continue
+
+        answer = result['answer']
+        passion = result['passion']
+
+        if answer:
+            count_yes += 1
+        else:
+            count_no += 1
+
+        total_passion += passion
+        print(f"Character {char_id} completed: {'Yes' if answer else 'No'} (passion: {passion:.2f})")
+
     # Return results as a dictionary
     return {
         'yes_count': count_yes,
@@ -550,6 +747,306 @@ def promptCharacters(question, num):
         'average_passion': total_passion / num if num > 0 else 0.0
     }
 
+# ============================================
+# GROUPED MODE - many characters per request
+# ============================================
+# When the account is RPM-bound rather than TPM-bound, one prompt per
+# request wastes quota: the instructions are mostly shared. These helpers
+# pack K characters into a single chat completion that returns a JSON array,
+# spending one request where the per-character path spends K.
+
+async def query_gpt_batch(prompts, model="gpt-4o-mini", max_tokens=150, temperature=QUERY_TEMPERATURE):
+    """
+    Answer several independent prompts with a single chat completion.
+
+    The model is told to reply with a JSON array of one answer per numbered
+    question. If the reply doesn't parse as an array of the right length,
+    falls back to one query_gpt call per prompt.
+
+    Returns:
+        list[str]: answers in the same order as prompts
+    """
+    instruction = (
+        f"Below are {len(prompts)} numbered, completely independent questions. "
+        f"Answer each one on its own. Respond with only a JSON array of exactly "
+        f"{len(prompts)} strings, one answer per question, in order."
+    )
+    numbered = "\n\n".join(
+        f"Question {idx}:\n{prompt}" for idx, prompt in enumerate(prompts, start=1)
+    )
+
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": instruction},
+            {"role": "user", "content": numbered}
+        ],
+        max_tokens=max_tokens * len(prompts),
+        temperature=temperature
+    )
+
+    try:
+        answers = json.loads(response.choices[0].message.content)
+        if isinstance(answers, list) and len(answers) == len(prompts):
+            return [str(answer) for answer in answers]
+    except json.JSONDecodeError:
+        pass
+
+    # Parse failure: retry each prompt individually
+    return list(await asyncio.gather(*(query_gpt(prompt, model) for prompt in prompts)))
+
+async def considerQuestionGroup(question, char_ids, limiter=None):
+    """
+    Run a group of characters through both calls using two requests total
+    instead of 2 * len(char_ids).
+
+    Returns:
+        dict: {char_id: {'response': str, 'answer': bool, 'passion': float}}
+    """
+    introduction_prompt = INTRODUCTION_PROMPT
+    pre_prompt = PRE_PROMPT
+    post_prompt = POST_PROMPT
+
+    personas = {cid: get_character_info(cid)['persona'] for cid in char_ids}
+
+    # One request for all of the group's introduction responses
+    intro_prompts = [personas[cid] + introduction_prompt for cid in char_ids]
+    responses_1 = await query_gpt_batch(intro_prompts)
+
+    # One request for all of the group's answers, as a JSON array of the
+    # same objects the structured per-character call returns
+    instruction = (
+        f"Below are {len(char_ids)} numbered, completely independent character "
+        f"prompts. Answer each one in character. Respond with only a JSON array "
+        f"of exactly {len(char_ids)} objects, in order, each with keys "
+        f'"response" (string), "answer" (boolean) and "passion" (number 0-1).'
+    )
+    numbered = "\n\n".join(
+        f"Character {idx}:\n{personas[cid]}{introduction_prompt}{response_1}{pre_prompt}{question}{post_prompt}"
+        for idx, (cid, response_1) in enumerate(zip(char_ids, responses_1), start=1)
+    )
+
+    response = await client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": instruction},
+            {"role": "user", "content": numbered}
+        ],
+        max_tokens=800 * len(char_ids),
+        temperature=0.8
+    )
+
+    try:
+        parsed = json.loads(response.choices[0].message.content)
+        if isinstance(parsed, list) and len(parsed) == len(char_ids):
+            return {
+                cid: {
+                    'response': str(item['response']),
+                    'answer': bool(item['answer']),
+                    'passion': float(item['passion'])
+                }
+                for cid, item in zip(char_ids, parsed)
+            }
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        pass
+
+    # Parse failure: fall back to the per-character structured calls,
+    # throttled through the shared limiter when one is provided
+    async def fallback(cid):
+        if limiter is not None:
+            await limiter.acquire(estimate_character_tokens(question), requests=2)
+        return await considerQuestion(question, cid)
+
+    results = await asyncio.gather(*(fallback(cid) for cid in char_ids))
+    return dict(zip(char_ids, results))
+
+async def promptCharactersGrouped(question, num, group_size=10, max_concurrency=10):
+    """
+    RPM-friendly variant of promptCharacters: characters are processed in
+    groups of group_size, two requests per group. Groups go through the
+    same RateLimiter/bounded-worker machinery as the per-character path,
+    with backoff-and-requeue on 429/5xx.
+    """
+    count_yes = 0
+    count_no  = 0
+    total_passion = 0.0
+
+    chunks = [list(range(start, min(start + group_size, num + 1)))
+              for start in range(1, num + 1, group_size)]
+
+    group_results = {}
+    limiter = RateLimiter(MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE)
+    per_character_tokens = estimate_character_tokens(question)
+
+    queue = asyncio.Queue()
+    for index in range(len(chunks)):
+        queue.put_nowait((index, 0))
+
+    async def worker():
+        while True:
+            try:
+                index, attempts = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            chunk = chunks[index]
+            # Two requests cover the whole group
+            await limiter.acquire(per_character_tokens * len(chunk), requests=2)
+            try:
+                group_results[index] = await considerQuestionGroup(question, chunk, limiter=limiter)
+            except (RateLimitError, InternalServerError) as exc:
+                attempts += 1
+                if attempts >= MAX_ATTEMPTS:
+                    print(f"Characters {chunk[0]}-{chunk[-1]} failed after {MAX_ATTEMPTS} attempts: {exc}")
+                else:
+                    # Exponential backoff with jitter before requeueing
+                    await asyncio.sleep(2 ** attempts + random.random())
+                    queue.put_nowait((index, attempts))
+            except Exception as exc:
+                print(f"Characters {chunk[0]}-{chunk[-1]} generated an exception: {exc}")
+
+    workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+    await asyncio.gather(*workers)
+
+    for index, chunk in enumerate(chunks):
+        group = group_results.get(index)
+        if group is None:
+            count_no += len(chunk)  # Count errors as "No" votes
+            continue
+
+        for char_id in chunk:
+            result = group[char_id]
+            update_character_chat(char_id, result['response'])
+            update_character_answer(char_id, result['answer'])
+            update_character_passion(char_id, result['passion'])
+
+            if result['answer']:
+                count_yes += 1
+            else:
+                count_no += 1
+            total_passion += result['passion']
+
+    return {
+        'yes_count': count_yes,
+        'no_count': count_no,
+        'total': num,
+        'average_passion': total_passion / num if num > 0 else 0.0
+    }
+
+# ============================================
+# BATCH MODE - OpenAI Batch API
+# ============================================
+# The big offline runs (all 1000 characters, results written to disk for
+# later analysis) aren't latency-sensitive, which is exactly what the Batch
+# API targets: 50% of the synchronous price, a separate rate-limit pool, and
+# a 24h completion window. One JSONL upload per phase replaces thousands of
+# individual HTTP round trips.
+
+async def run_batch(jsonl_path, batch_requests, poll_interval=30):
+    """
+    Submit a list of /v1/chat/completions request dicts as one batch and
+    block until it finishes.
+
+    Returns:
+        dict: {custom_id: response message content}
+    """
+    with open(jsonl_path, 'w', encoding='utf-8') as f:
+        for batch_request in batch_requests:
+            f.write(json.dumps(batch_request) + "\n")
+
+    with open(jsonl_path, 'rb') as f:
+        batch_file = await client.files.create(file=f, purpose="batch")
+
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+
+    # Poll until the batch reaches a terminal state
+    while True:
+        batch = await client.batches.retrieve(batch.id)
+        if batch.status == "completed":
+            break
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+        await asyncio.sleep(poll_interval)
+
+    output = await client.files.content(batch.output_file_id)
+
+    responses = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        responses[record["custom_id"]] = record["response"]["body"]["choices"][0]["message"]["content"]
+    return responses
+
+async def promptCharactersBatch(question, num):
+    """
+    Batch-mode counterpart of promptCharacters: the introduction calls go
+    out as one batch, their responses feed the question prompts for a second
+    batch, and the answers are dispatched to writeOut.
+    """
+    introduction_prompt = INTRODUCTION_PROMPT
+    pre_prompt = PRE_PROMPT
+    post_prompt = POST_PROMPT
+
+    personas = {i: get_character_info(i)['persona'] for i in range(1, num+1)}
+
+    # Phase 1: every character crafts its immersive persona description
+    intro_requests = [
+        {
+            "custom_id": f"intro-{i:04d}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "system", "content": personas[i] + introduction_prompt}
+                ],
+                "max_tokens": 150,
+                "temperature": QUERY_TEMPERATURE
+            }
+        }
+        for i in range(1, num+1)
+    ]
+    intro_responses = await run_batch("batch_intro.jsonl", intro_requests)
+
+    # Phase 2: feed each phase-1 response into the question prompt
+    question_requests = [
+        {
+            "custom_id": f"question-{i:04d}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "system", "content": personas[i] + introduction_prompt
+                        + intro_responses[f"intro-{i:04d}"] + pre_prompt + question + post_prompt}
+                ],
+                "max_tokens": 800,
+                "temperature": 0.8
+            }
+        }
+        for i in range(1, num+1)
+        if f"intro-{i:04d}" in intro_responses
+    ]
+    question_responses = await run_batch("batch_question.jsonl", question_requests)
+
+    ensureCharacterDirs(num)
+
+    short_answers = []
+    for i in range(1, num+1):
+        answer = question_responses.get(f"question-{i:04d}")
+        if answer is None:
+            print(f"Character {i} missing from batch output")
+            continue
+        short_answers.append((f"{i:04d}", writeOut(answer, i)))
+
+    # One aggregated index for downstream analysis, written post-loop
+    writeShortAnswers(short_answers)
+
 # ============================================
 # SERVER CODE - Flask API
 # ============================================
@@ -583,8 +1080,11 @@ def handle_question():
         # Store the global question in Redis
         set_global_question(question)
         
-        # Call your existing function to get responses from characters (100 characters)
-        results = promptCharacters(question, 100)
+        # Call your existing function to get responses from characters
+        # (100 characters). No checkpoint here: resumed characters skip
+        # process_character and so would leave their Redis state at the
+        # defaults - checkpointing belongs to the offline 1000-character runs.
+        results = run_async(promptCharacters(question, 100, checkpoint_path=None))
         
         # Update cache with results - the promptCharacters function
         # should now also update the cache (see modified process_character)
@@ -653,7 +1153,7 @@ def handle_conversation():
                 response = f"{char_info['name']}: {char_data['chat']}"
             else:
                 # Subsequent characters respond to the conversation
-                response_text = character_conversation_response(char_id, conversation)
+                response_text = run_async(character_conversation_response(char_id, conversation))
                 response = f"{char_info['name']}: {response_text}"
             
             # Add to conversation log
@@ -665,7 +1165,7 @@ def handle_conversation():
             char_id = char_data['id']
             
             # Check if mind changed
-            result = check_mind_changed(char_id, conversation)
+            result = run_async(check_mind_changed(char_id, conversation))
             
             # Update Redis with new answer and passion
             update_character_answer(char_id, result['answer'])
@@ -0,0 +1,41 @@
+"""
+Deterministic response cache for OpenAI chat completions.
+
+Identical (model, messages, temperature) payloads hash to the same key, so
+re-runs after a crash - or repeated iteration on the question wording - skip
+the API call entirely for characters whose response is already cached. Backed
+by the same Redis instance the app already uses for character state.
+"""
+
+import hashlib
+import json
+
+
+def cache_key(model, messages, temperature):
+    """Stable sha256 key over the exact request payload."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Thin get/set wrapper storing responses under a key prefix.
+
+    Entries expire after ttl seconds (default three days) so the
+    llmcache: keyspace doesn't grow without bound across question
+    iterations.
+    """
+
+    def __init__(self, redis_client, prefix="llmcache:", ttl=3 * 24 * 60 * 60):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        """Return the cached response text, or None on a miss."""
+        return self.redis_client.get(self.prefix + key)
+
+    def set(self, key, value):
+        self.redis_client.set(self.prefix + key, value, ex=self.ttl)